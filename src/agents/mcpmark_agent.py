@@ -17,7 +17,7 @@ import litellm
 import nest_asyncio
 
 from src.logger import get_logger
-from src.skill_manager import SkillManager
+from src.skill_manager import SkillManager, get_skill_manager
 from .base_agent import BaseMCPAgent
 from .mcp import MCPStdioServer, MCPHttpServer
 
@@ -79,12 +79,11 @@ class MCPMarkAgent(BaseMCPAgent):
             reasoning_effort=reasoning_effort,
         )
         
-        # Initialize skill manager (singleton pattern)
-        if MCPMarkAgent._skill_manager is None:
-            # Get the project root directory (two levels up from this file)
-            project_root = Path(__file__).parent.parent.parent
-            skill_dir = project_root / "skills"
-            MCPMarkAgent._skill_manager = SkillManager(skill_dir=str(skill_dir))
+        # Get the shared skill manager (reloaded only if skills changed on disk).
+        # The project root directory is two levels up from this file.
+        project_root = Path(__file__).parent.parent.parent
+        skill_dir = project_root / "skills"
+        MCPMarkAgent._skill_manager = get_skill_manager(skill_dir=str(skill_dir))
         
         # Build system prompt with skill information
         self.SYSTEM_PROMPT = self._build_system_prompt()
@@ -231,7 +230,7 @@ class MCPMarkAgent(BaseMCPAgent):
         Returns:
             Dictionary containing execution results
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             # Reset partial progress for this run
@@ -260,7 +259,7 @@ class MCPMarkAgent(BaseMCPAgent):
                 timeout=self.timeout
             )
             
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             
             # Update usage statistics
             self.usage_tracker.update(
@@ -274,7 +273,7 @@ class MCPMarkAgent(BaseMCPAgent):
             return result
         
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             if isinstance(e, asyncio.TimeoutError):
                 error_msg = f"Execution timed out after {self.timeout} seconds"
                 logger.error(error_msg)
@@ -348,7 +347,8 @@ class MCPMarkAgent(BaseMCPAgent):
         # Create and start MCP server
         mcp_server = await self._create_mcp_server()
         
-        async with mcp_server:
+        # One HTTP client for the whole run, so every turn reuses its keep-alive connection
+        async with mcp_server, httpx.AsyncClient() as http_client:
             # Get available tools
             tools = await mcp_server.list_tools()
             
@@ -358,12 +358,13 @@ class MCPMarkAgent(BaseMCPAgent):
             # Execute with function calling loop
             return await self._execute_anthropic_native_tool_loop(
                 instruction, anthropic_tools, mcp_server, 
-                thinking_budget, tool_call_log_file
+                thinking_budget, http_client, tool_call_log_file
             )
     
 
     async def _call_claude_native_api(
         self,
+        http_client: httpx.AsyncClient,
         messages: List[Dict],
         thinking_budget: int,
         tools: Optional[List[Dict]] = None,
@@ -374,6 +375,7 @@ class MCPMarkAgent(BaseMCPAgent):
         Call Claude's native API directly using httpx.
         
         Args:
+            http_client: Shared HTTP client used for the request
             messages: Conversation messages
             thinking_budget: Token budget for thinking
             tools: Tool definitions for function calling
@@ -408,9 +410,10 @@ class MCPMarkAgent(BaseMCPAgent):
                 "budget_tokens": thinking_budget
             }
         
-        # Add tools if provided
+        # Add tools if provided. The tool list and system prompt are identical on
+        # every turn, so they are marked as a cacheable prompt prefix
         if tools:
-            payload["tools"] = tools
+            payload["tools"] = tools[:-1] + [{**tools[-1], "cache_control": {"type": "ephemeral"}}]
             payload["tool_choice"] = {"type": "auto"}
         
         # Add MCP servers if provided
@@ -420,23 +423,24 @@ class MCPMarkAgent(BaseMCPAgent):
         
         # Add system prompt if provided
         if system:
-            payload["system"] = system
+            payload["system"] = [
+                {"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}
+            ]
         
         # Make the API call
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{api_base}/v1/messages",
-                    headers=headers,
-                    json=payload,
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-                return response.json(), None
-            except httpx.HTTPStatusError as e:
-                return None, e.response.text
-            except Exception as e:
-                return None, e
+        try:
+            response = await http_client.post(
+                f"{api_base}/v1/messages",
+                headers=headers,
+                json=payload,
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            return response.json(), None
+        except httpx.HTTPStatusError as e:
+            return None, e.response.text
+        except Exception as e:
+            return None, e
     
 
     async def _execute_anthropic_native_tool_loop(
@@ -445,6 +449,7 @@ class MCPMarkAgent(BaseMCPAgent):
         tools: List[Dict],
         mcp_server: Any,
         thinking_budget: int,
+        http_client: httpx.AsyncClient,
         tool_call_log_file: Optional[str] = None
     ) -> Dict[str, Any]:
         """
@@ -467,6 +472,7 @@ class MCPMarkAgent(BaseMCPAgent):
             
             # Call Claude native API
             response, error_msg = await self._call_claude_native_api(
+                http_client=http_client,
                 messages=messages,
                 thinking_budget=thinking_budget,
                 tools=tools,
@@ -481,7 +487,12 @@ class MCPMarkAgent(BaseMCPAgent):
             # Update token usage
             if "usage" in response:
                 usage = response["usage"]
-                input_tokens = usage.get("input_tokens", 0)
+                # Prompt-cache reads and writes are reported apart from input_tokens
+                input_tokens = (
+                    usage.get("input_tokens", 0)
+                    + (usage.get("cache_creation_input_tokens") or 0)
+                    + (usage.get("cache_read_input_tokens") or 0)
+                )
                 output_tokens = usage.get("output_tokens", 0)
                 # Calculate output tokens as total - input for consistency
                 total_tokens_count = output_tokens + input_tokens
@@ -761,31 +772,32 @@ class MCPMarkAgent(BaseMCPAgent):
         # Record initial state
         self._update_progress(messages, total_tokens, turn_count)
         
+        # Build completion kwargs once; `messages` is the same list object that
+        # grows every turn, so the dict stays current for the whole loop
+        completion_kwargs = {
+            "model": self.litellm_input_model_name,
+            "messages": messages,
+            "api_key": self.api_key,
+        }
+        
+        # # Always use tools format if available - LiteLLM will handle conversion
+        # if tools:
+        #     completion_kwargs["tools"] = tools
+        #     completion_kwargs["tool_choice"] = "auto"
+        
+        # Add reasoning_effort and base_url if specified
+        if self.reasoning_effort != "default":
+            completion_kwargs["reasoning_effort"] = self.reasoning_effort
+        if self.base_url:
+            completion_kwargs["base_url"] = self.base_url
+        
+        # For custom providers (like gzy/), tell litellm to treat as OpenAI-compatible
+        if self.litellm_input_model_name.startswith("gzy/"):
+            completion_kwargs["custom_llm_provider"] = "openai"
+        
         try:
             while turn_count < max_turns:
                 
-                # Build completion kwargs
-                completion_kwargs = {
-                    "model": self.litellm_input_model_name,
-                    "messages": messages,
-                    "api_key": self.api_key,
-                }
-                
-                # # Always use tools format if available - LiteLLM will handle conversion
-                # if tools:
-                #     completion_kwargs["tools"] = tools
-                #     completion_kwargs["tool_choice"] = "auto"
-                
-                # Add reasoning_effort and base_url if specified
-                if self.reasoning_effort != "default":
-                    completion_kwargs["reasoning_effort"] = self.reasoning_effort
-                if self.base_url:
-                    completion_kwargs["base_url"] = self.base_url
-                
-                # For custom providers (like gzy/), tell litellm to treat as OpenAI-compatible
-                if self.litellm_input_model_name.startswith("gzy/"):
-                    completion_kwargs["custom_llm_provider"] = "openai"
-                
                 try:
                     # Call LiteLLM with timeout for individual call
                     # debug_messages = [{"role":"system", "content": "You are a helpful assistant."},
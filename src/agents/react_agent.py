@@ -57,7 +57,7 @@ class ReActAgent(BaseMCPAgent):
         instruction: str,
         tool_call_log_file: Optional[str] = None,
     ) -> Dict[str, Any]:
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         try:
             self._reset_progress()
@@ -67,7 +67,7 @@ class ReActAgent(BaseMCPAgent):
                 return await self._execute_react_loop(instruction, tool_call_log_file)
 
             result = await asyncio.wait_for(_run_react(), timeout=self.timeout)
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             self.usage_tracker.update(
                 success=result.get("success", False),
                 token_usage=result.get("token_usage", {}),
@@ -77,7 +77,7 @@ class ReActAgent(BaseMCPAgent):
             result["execution_time"] = execution_time
             return result
         except Exception as exc:  # noqa: BLE001
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
 
             if isinstance(exc, asyncio.TimeoutError):
                 error_msg = f"Execution timed out after {self.timeout} seconds"
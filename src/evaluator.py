@@ -181,21 +181,21 @@ class MCPEvaluator:
         Runs a single task, including setup, agent execution, verification, and cleanup.
         """
         # Track overall task start time
-        task_start_time = time.time()
+        task_start_time = time.perf_counter()
 
         # ------------------------------------------------------------------
         # Stage 1: Set up the initial state for the task
         # ------------------------------------------------------------------
-        setup_start_time = time.time()
+        setup_start_time = time.perf_counter()
         logger.info(
             "\n┌─ Stage 1: Setup ─────────────────────────────────────────────────────"
         )
         setup_success = self.state_manager.set_up(task)
-        setup_time = time.time() - setup_start_time
+        setup_time = time.perf_counter() - setup_start_time
 
         if not setup_success:
             logger.error(f"| State setup failed for task: {task.name}")
-            task_total_time = time.time() - task_start_time
+            task_total_time = time.perf_counter() - task_start_time
             return TaskResult(
                 task_name=task.name,
                 success=False,
@@ -217,7 +217,7 @@ class MCPEvaluator:
             "┌─ Stage 2: Execute ───────────────────────────────────────────────────"
         )
 
-        agent_execution_start_time = time.time()
+        agent_execution_start_time = time.perf_counter()
 
         # Get task instruction from task manager
         task_instruction = self.task_manager.get_task_instruction(task)
@@ -236,7 +236,7 @@ class MCPEvaluator:
             task_instruction, str(execution_log_path)
         )
 
-        agent_execution_time = time.time() - agent_execution_start_time
+        agent_execution_time = time.perf_counter() - agent_execution_start_time
         
         # Extract actual model name from LiteLLM response
         if agent_result.get("litellm_run_model_name"):
@@ -258,7 +258,7 @@ class MCPEvaluator:
         logger.info(
             "┌─ Stage 3: Verify ────────────────────────────────────────────────────"
         )
-        verify_start_time = time.time()
+        verify_start_time = time.perf_counter()
         try:
             result = self.task_manager.execute_task(task, agent_result)
         finally:
@@ -268,7 +268,7 @@ class MCPEvaluator:
             os.environ.pop("MCP_MESSAGES", None)
             os.environ.pop("MCP_GITHUB_TOKEN", None)
             
-        verify_time = time.time() - verify_start_time
+        verify_time = time.perf_counter() - verify_start_time
         logger.info(f"└─ Completed in {self._format_duration(verify_time)}\n")
 
         # ------------------------------------------------------------------
@@ -277,13 +277,13 @@ class MCPEvaluator:
         logger.info(
             "┌─ Stage 4: Cleanup ───────────────────────────────────────────────────"
         )
-        cleanup_start_time = time.time()
+        cleanup_start_time = time.perf_counter()
         self.state_manager.clean_up(task)
-        cleanup_time = time.time() - cleanup_start_time
+        cleanup_time = time.perf_counter() - cleanup_start_time
         logger.info(f"└─ Completed in {self._format_duration(cleanup_time)}\n")
 
         # Calculate total task execution time
-        task_total_time = time.time() - task_start_time
+        task_total_time = time.perf_counter() - task_start_time
 
         # Add timing information to the result
         result.agent_execution_time = agent_execution_time
@@ -9,23 +9,88 @@ YAML frontmatter and usage instructions.
 
 import os
 import re
+import selectors
+import shlex
 import subprocess
+import sys
+import threading
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 
 from src.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Patterns used on every model response
+_CODE_BLOCK_RE = re.compile(r'```(?:bash|shell|python|sh)\s*\n(.*?)```', re.DOTALL)
+# Escape sequences and quote characters: the only tokens quote scanning cares about
+_QUOTE_TOKEN_RE = re.compile(r'\\.|[\'"]', re.DOTALL)
 
-@dataclass
+# Read buffer size for SKILL.md frontmatter scanning; typical frontmatter fits in one read
+_FRONTMATTER_CHUNK_SIZE = 4096
+
+# Entries of the skill directory that are never skill folders (besides dot-dirs)
+_IGNORED_SKILL_DIRS = frozenset({"__pycache__", "node_modules", "venv"})
+
+# Subprocess output is drained in chunks of this size; anything beyond the cap
+# (per stream) is discarded so a chatty script cannot blow up memory
+_PIPE_READ_SIZE = 65536
+_MAX_OUTPUT_BYTES = 8 * 1024 * 1024
+_TRUNCATED_MARKER = b"\n[truncated]"
+
+# Static parts of the skill summary prompt; only the skill list between them varies
+_SUMMARY_HEADER = (
+    "\n## Available Skills\n"
+    "You are equipped with the following specialized skills. "
+    "When a task aligns with a specific skill, adopt the methodology described within that skill. "
+    "For tasks that do not fall under any specific skill, proceed by using your own reasoning and inherent knowledge.\n"
+)
+_SUMMARY_FOOTER = (
+    "\n\n### Skill Usage Protocol\n\n"
+    "When you identify that a task requires a skill:\n"
+    "1. Explicitly mention the skill name in your response (e.g., 'I will use the file-size-classification skill') and stop this response IMMEDIATELY.\n"
+    "2. The full skill documentation will be provided to you automatically\n"
+    "3. After reviewing the documentation, output commands using one of these formats:\n\n"
+    "**Format - Code Block:**\n"
+    "```bash\n"
+    "python script.py /path/to/directory --arg1 value1 --arg2 value2\n"
+    "```\n\n"
+    "**Important Notes:**\n"
+    "- Commands will be executed automatically and their output will be provided back to you\n"
+    "- After mentioning a skill by name, STOP your current response immediately. Do NOT output ANY commands until the next turn, when you receive and review the complete skill specification (including name, description, and usage instructions).\n"
+    "- When executing Python scripts, use the script name directly without path prefixes (e.g., 'python script.py' not 'python /path/to/script.py'). The system will locate the script automatically\n"
+    "Now, in this turn, please output ONLY the skill you have selected. Use the following format: 'I will use the [skill name] skill'. Do NOT output any code or commands besides this statement.\n"
+)
+
+
+@dataclass(slots=True, frozen=True)
 class SkillMetadata:
     """Metadata extracted from SKILL.md YAML frontmatter"""
     name: str
     description: str
     skill_path: Path
-    full_content: str
+    md_path: Path
+    name_lower: str  # Lowercased name, used for trigger detection
+    normalized_name_lower: str  # Same, with hyphens/underscores as spaces
+
+
+def _is_skill_folder_candidate(entry: os.DirEntry) -> bool:
+    """Check whether a skill directory entry may be a skill folder (not hidden or a cache dir)"""
+    return (
+        not entry.name.startswith('.')
+        and entry.name not in _IGNORED_SKILL_DIRS
+        and entry.is_dir()
+    )
+
+
+@lru_cache(maxsize=8)
+def _read_skill_md(md_path: Path) -> str:
+    """Read a full SKILL.md file. Memoized so repeated activations skip the disk."""
+    with open(md_path, 'r', encoding='utf-8') as f:
+        return f.read()
 
 
 class SkillManager:
@@ -38,6 +103,10 @@ class SkillManager:
     - Full documentation: usage examples and parameters
     """
     
+    # Scan results shared by all instances:
+    # resolved skill_dir -> (catalog stamp, skills, script index)
+    _scan_cache: Dict[str, Tuple[Optional[Tuple], Dict[str, SkillMetadata], Dict[str, Path]]] = {}
+    
     def __init__(self, skill_dir: str = "skills", venv_path: Optional[str] = None):
         """
         Initialize the skill manager.
@@ -48,34 +117,201 @@ class SkillManager:
         """
         self.skill_dir = Path(skill_dir)
         self.venv_path = Path(venv_path) if venv_path else Path(".venv")
+        self.project_root = Path(__file__).parent.parent
+        self.python_executable = self._resolve_python_executable()
         self.skills: Dict[str, SkillMetadata] = {}
-        self._scan_skills()
+        self._script_index: Dict[str, Path] = {}  # script name -> resolved path
+        self._script_argv: Dict[str, List[str]] = {}  # script name -> [python, script path]
+        self._trigger_group_to_name: Dict[str, str] = {}  # regex group name -> skill name
+        self._skill_trigger_re: Optional[re.Pattern] = None
+        self._summary_prompt_cache: Optional[str] = None
+        self._catalog_stamp: Optional[Tuple] = None
+        self.reload()
+    
+    def reload(self):
+        """
+        Reload all skills and reset caches.
+        
+        Scan results are shared between instances for the same directory, so
+        the directory is only rescanned if skills changed on disk since.
+        """
+        self.skills = {}
+        self._script_index = {}
+        _read_skill_md.cache_clear()
+        
+        cache_key = str(self.skill_dir.resolve())
+        cached = SkillManager._scan_cache.get(cache_key)
+        if cached and self._get_catalog_stamp() == cached[0]:
+            self._summary_prompt_cache = None
+            self._catalog_stamp, skills, script_index = cached
+            self.skills = dict(skills)
+            self._script_index = dict(script_index)
+        else:
+            self._scan_skills()
+            self._catalog_stamp = self._get_catalog_stamp()
+            SkillManager._scan_cache[cache_key] = (
+                self._catalog_stamp, dict(self.skills), dict(self._script_index)
+            )
+        
+        # Base argv of every indexed script, so running one only appends its arguments
+        self._script_argv = {
+            name: [self.python_executable, str(path)]
+            for name, path in self._script_index.items()
+        }
+        self._build_trigger_index()
+    
+    def is_stale(self) -> bool:
+        """Check whether skills were added, removed or edited since the last scan."""
+        return self._get_catalog_stamp() != self._catalog_stamp
+    
+    def _get_catalog_stamp(self) -> Optional[Tuple]:
+        """
+        Snapshot the modification times that determine a skill catalog: the
+        skill directory, and every skill folder with its scripts/ directory and
+        SKILL.md. Folders whose SKILL.md failed to load are included too, so an
+        in-place fix of an invalid SKILL.md is detected.
+        
+        Returns:
+            Tuple of modification times, or None if the skill directory is missing
+        """
+        try:
+            stamp = [os.stat(self.skill_dir).st_mtime_ns]
+            with os.scandir(self.skill_dir) as entries:
+                for entry in entries:
+                    if _is_skill_folder_candidate(entry):
+                        stamp.append((entry.name, entry.stat().st_mtime_ns))
+                        for name in ("scripts", "SKILL.md"):
+                            try:
+                                stamp.append(os.stat(os.path.join(entry.path, name)).st_mtime_ns)
+                            except FileNotFoundError:
+                                stamp.append(None)
+        except OSError:
+            return None
+        
+        return tuple(stamp)
+    
+    def _resolve_python_executable(self) -> str:
+        """
+        Determine the Python executable used to run skill scripts.
+        
+        Returns:
+            Path to the venv's Python if the venv exists, otherwise "python"
+        """
+        venv_activate = self.project_root / self.venv_path / "bin" / "activate"
+        
+        if venv_activate.exists():
+            # Use the venv's Python executable directly (avoids shell escaping issues)
+            python_executable = self.project_root / self.venv_path / "bin" / "python"
+            if python_executable.exists():
+                return str(python_executable)
+            return "python"  # Fallback
+        
+        logger.warning(f"Virtual environment not found at {self.venv_path}, running without venv")
+        return "python"
     
     def _scan_skills(self):
         """Scan the skill directory and load all SKILL.md files"""
+        self._summary_prompt_cache = None
+        
         if not self.skill_dir.exists():
             logger.warning(f"Skill directory not found: {self.skill_dir}")
             return
         
-        for skill_folder in self.skill_dir.iterdir():
-            if not skill_folder.is_dir():
-                continue
+        # scandir entries carry the file type, so is_dir() needs no extra stat;
+        # hidden and cache directories are skipped by name before that
+        with os.scandir(self.skill_dir) as entries:
+            skill_folders = [
+                Path(entry.path) for entry in entries if _is_skill_folder_candidate(entry)
+            ]
+        
+        # Each load reads only a small frontmatter block, so a serial loop beats
+        # a thread pool even for catalogs of hundreds of skills
+        for folder in skill_folders:
+            metadata = self._load_skill_folder(folder)
+            if metadata:
+                self.skills[metadata.name] = metadata
+                logger.debug(f"Loaded skill: {metadata.name}")
+        
+        self._script_index = self._index_skill_scripts(skill_folders)
+    
+    def _index_skill_scripts(self, skill_folders: List[Path]) -> Dict[str, Path]:
+        """
+        Index the files in the scripts/ subdirectory of every skill folder.
+        
+        Args:
+            skill_folders: Skill folders, in directory order
             
-            skill_md_path = skill_folder / "SKILL.md"
-            if not skill_md_path.exists():
+        Returns:
+            Dict mapping script file name to its absolute path. If several
+            skills ship a script with the same name, the first folder wins.
+        """
+        script_index: Dict[str, Path] = {}
+        
+        for skill_folder in skill_folders:
+            try:
+                with os.scandir(skill_folder / "scripts") as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            script_index.setdefault(entry.name, Path(os.path.abspath(entry.path)))
+            except (FileNotFoundError, NotADirectoryError):
                 continue
+        
+        return script_index
+    
+    def _load_skill_folder(self, skill_folder: Path) -> Optional[SkillMetadata]:
+        """
+        Load the SKILL.md of a single skill folder.
+        
+        Args:
+            skill_folder: Path to the skill folder
             
-            try:
-                metadata = self._parse_skill_md(skill_md_path, skill_folder)
-                if metadata:
-                    self.skills[metadata.name] = metadata
-                    logger.debug(f"Loaded skill: {metadata.name}")
-            except Exception as e:
-                logger.error(f"Failed to load skill from {skill_folder}: {e}")
+        Returns:
+            SkillMetadata object, or None if the folder has no valid SKILL.md
+        """
+        try:
+            return self._parse_skill_md(skill_folder / "SKILL.md", skill_folder)
+        except FileNotFoundError:
+            # Not a skill folder (no SKILL.md)
+            return None
+        except Exception as e:
+            logger.error(f"Failed to load skill from {skill_folder}: {e}")
+            return None
+    
+    def _build_trigger_index(self):
+        """
+        Compile the lowercased trigger strings of all skills (computed once at
+        parse time) into a single alternation, so detection scans the text in
+        one pass.
+        """
+        trigger_to_name: Dict[str, str] = {}
+        for skill_name, metadata in self.skills.items():
+            # Exact skill name, and the name with hyphens/underscores as spaces
+            for trigger in (metadata.name_lower, metadata.normalized_name_lower):
+                if trigger:
+                    trigger_to_name.setdefault(trigger, skill_name)
+        
+        self._trigger_group_to_name = {}
+        if not trigger_to_name:
+            self._skill_trigger_re = None
+            return
+        
+        # One named group per trigger, so a match maps straight back to its
+        # skill via match.lastgroup. Longest triggers first so a name that
+        # contains another one wins.
+        triggers = sorted(trigger_to_name, key=len, reverse=True)
+        alternatives = []
+        for i, trigger in enumerate(triggers):
+            group_name = f"t{i}"
+            self._trigger_group_to_name[group_name] = trigger_to_name[trigger]
+            alternatives.append(f"(?P<{group_name}>{re.escape(trigger)})")
+        # Case-insensitive, so responses are searched as-is without a lowercased copy
+        self._skill_trigger_re = re.compile('|'.join(alternatives), re.IGNORECASE)
     
     def _parse_skill_md(self, md_path: Path, skill_folder: Path) -> Optional[SkillMetadata]:
         """
-        Parse SKILL.md file to extract metadata and full content.
+        Parse SKILL.md frontmatter to extract metadata.
+        Only the frontmatter is read; the full content is loaded on demand
+        by get_skill_full_content().
         
         Args:
             md_path: Path to SKILL.md file
@@ -84,30 +320,45 @@ class SkillManager:
         Returns:
             SkillMetadata object or None if parsing fails
         """
-        with open(md_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        name = None
+        description = None
+        closed = False
+        
+        # Scan the frontmatter line by line and stop at its closing delimiter,
+        # so the body is never read or decoded
+        with open(md_path, 'rb', buffering=_FRONTMATTER_CHUNK_SIZE) as f:
+            if f.readline().rstrip() == b'---':
+                for raw_line in f:
+                    line = raw_line.decode('utf-8')
+                    if line.rstrip() == '---':
+                        closed = True
+                        break
+                    
+                    # Simple parsing for name and description
+                    if name is None and line.startswith('name:'):
+                        name = line[5:].strip()
+                    elif description is None and line.startswith('description:'):
+                        description = line[12:].strip()
         
-        # Extract YAML frontmatter
-        frontmatter_match = re.match(r'^---\s*\n(.*?)\n---\s*\n', content, re.DOTALL)
-        if not frontmatter_match:
+        if not closed:
             logger.warning(f"No YAML frontmatter found in {md_path}")
             return None
         
-        frontmatter = frontmatter_match.group(1)
-        
-        # Parse YAML frontmatter (simple parsing for name and description)
-        name_match = re.search(r'^name:\s*(.+)$', frontmatter, re.MULTILINE)
-        desc_match = re.search(r'^description:\s*(.+)$', frontmatter, re.MULTILINE)
-        
-        if not name_match or not desc_match:
+        if not name or not description:
             logger.warning(f"Missing name or description in {md_path}")
             return None
         
+        # Names are used as keys in several lookup tables; intern them so all
+        # references share one object
+        name = sys.intern(name)
+        
         return SkillMetadata(
-            name=name_match.group(1).strip(),
-            description=desc_match.group(1).strip(),
+            name=name,
+            description=description,
             skill_path=skill_folder,
-            full_content=content
+            md_path=md_path,
+            name_lower=sys.intern(name.lower()),
+            normalized_name_lower=sys.intern(name.replace('-', ' ').replace('_', ' ').lower())
         )
     
     def get_skill_summary_prompt(self) -> str:
@@ -118,41 +369,29 @@ class SkillManager:
         Returns:
             Formatted string with skill summaries
         """
+        # The skill catalog is fixed after scanning, so render the prompt only once
+        if self._summary_prompt_cache is not None:
+            return self._summary_prompt_cache
+        
         if not self.skills:
             return ""
         
         prompt_parts = [
-            "\n## Available Skills\n",
-            "You are equipped with the following specialized skills. "
-            "When a task aligns with a specific skill, adopt the methodology described within that skill. "
-            "For tasks that do not fall under any specific skill, proceed by using your own reasoning and inherent knowledge.\n"
+            _SUMMARY_HEADER,
+            "".join(
+                f"\n- **{skill_name}**: {metadata.description}"
+                for skill_name, metadata in self.skills.items()
+            ),
+            _SUMMARY_FOOTER,
         ]
         
-        for skill_name, metadata in self.skills.items():
-            prompt_parts.append(f"\n- **{skill_name}**: {metadata.description}")
-        
-        prompt_parts.append(
-            "\n\n### Skill Usage Protocol\n\n"
-            "When you identify that a task requires a skill:\n"
-            "1. Explicitly mention the skill name in your response (e.g., 'I will use the file-size-classification skill') and stop this response IMMEDIATELY.\n"
-            "2. The full skill documentation will be provided to you automatically\n"
-            "3. After reviewing the documentation, output commands using one of these formats:\n\n"
-            "**Format - Code Block:**\n"
-            "```bash\n"
-            "python script.py /path/to/directory --arg1 value1 --arg2 value2\n"
-            "```\n\n"
-            "**Important Notes:**\n"
-            "- Commands will be executed automatically and their output will be provided back to you\n"
-            "- After mentioning a skill by name, STOP your current response immediately. Do NOT output ANY commands until the next turn, when you receive and review the complete skill specification (including name, description, and usage instructions).\n"
-            "- When executing Python scripts, use the script name directly without path prefixes (e.g., 'python script.py' not 'python /path/to/script.py'). The system will locate the script automatically\n"
-            "Now, in this turn, please output ONLY the skill you have selected. Use the following format: 'I will use the [skill name] skill'. Do NOT output any code or commands besides this statement.\n"
-        )
-        
-        return "".join(prompt_parts)
+        self._summary_prompt_cache = "".join(prompt_parts)
+        return self._summary_prompt_cache
     
     def detect_skill_trigger(self, text: str) -> Optional[str]:
         """
         Detect if the agent's response mentions a skill.
+        If several skills are mentioned, the first one in the text wins.
         
         Args:
             text: Text to search for skill mentions
@@ -160,19 +399,14 @@ class SkillManager:
         Returns:
             Skill name if detected, None otherwise
         """
-        text_lower = text.lower()
+        if self._skill_trigger_re is None:
+            return None
         
-        for skill_name in self.skills.keys():
-            # Check for exact skill name mention
-            if skill_name.lower() in text_lower:
-                return skill_name
-            
-            # Check for skill name with spaces replaced by hyphens/underscores
-            normalized_name = skill_name.replace('-', ' ').replace('_', ' ')
-            if normalized_name.lower() in text_lower:
-                return skill_name
+        match = self._skill_trigger_re.search(text)
+        if not match:
+            return None
         
-        return None
+        return self._trigger_group_to_name[match.lastgroup]
     
     def get_skill_full_content(self, skill_name: str) -> Optional[str]:
         """
@@ -188,7 +422,11 @@ class SkillManager:
         if not metadata:
             return None
         
-        return metadata.full_content
+        try:
+            return _read_skill_md(metadata.md_path)
+        except OSError as e:
+            logger.error(f"Failed to read {metadata.md_path}: {e}")
+            return None
     
     def _locate_skill_script(self, script_name: str) -> Optional[Path]:
         """
@@ -200,20 +438,24 @@ class SkillManager:
         Returns:
             Absolute path to the script if found, None otherwise
         """
-        
-        # Search in scripts/ subdirectory of all skill folders
-        for skill_folder in self.skill_dir.iterdir():
-            if not skill_folder.is_dir():
-                continue
-            
-            scripts_dir = skill_folder / "scripts"
-            if not scripts_dir.is_dir():
-                continue
-            
-            script_path = scripts_dir / script_name
-            if script_path.exists():
-                logger.debug(f"Located script '{script_name}' in {skill_folder.name}/scripts: {script_path}")
-                return script_path.resolve()
+        script_path = self._script_index.get(script_name)
+        if script_path is not None:
+            return script_path
+        
+        # Not indexed at scan time (added since, or a nested path):
+        # search in scripts/ subdirectory of all skill folders
+        with os.scandir(self.skill_dir) as entries:
+            for entry in entries:
+                if not _is_skill_folder_candidate(entry):
+                    continue
+                
+                # A single stat: fails as well when there is no scripts/ directory
+                script_path = os.path.join(entry.path, "scripts", script_name)
+                if os.path.exists(script_path):
+                    logger.debug(f"Located script '{script_name}' in {entry.name}/scripts: {script_path}")
+                    script_path = Path(script_path).resolve()
+                    self._script_index[script_name] = script_path
+                    return script_path
         
         logger.warning(f"Script '{script_name}' not found in any skill directory")
         return None
@@ -234,7 +476,9 @@ class SkillManager:
         Returns:
             Tuple of (success, stdout, stderr)
         """
-        command = command.strip()
+        # Only leading whitespace matters for dispatch; downstream parsing
+        # (shlex / -c extraction / bash) ignores trailing whitespace anyway
+        command = command.lstrip()
         
         # Determine working directory
         if working_dir:
@@ -272,20 +516,22 @@ class SkillManager:
         Returns:
             Tuple of (success, stdout, stderr)
         """
-        import shlex
-        
         # Special handling for run_fs_ops.py -c "..." commands containing write_file
         # These often contain complex strings that break shlex parsing
         if 'run_fs_ops.py' in command and ' -c ' in command and 'write_file' in command:
             return self._execute_write_file_command(command, cwd)
         
         # Parse the command to extract script name and arguments
-        # Use shlex to properly handle quoted arguments with special characters
-        try:
-            parts = shlex.split(command)
-        except ValueError as e:
-            logger.error(f"Failed to parse command: {command}, error: {e}")
-            return False, "", f"Failed to parse command: {e}"
+        # Use shlex to properly handle quoted arguments with special characters.
+        # Without quotes or escapes, shlex would only split on whitespace.
+        if "'" in command or '"' in command or '\\' in command:
+            try:
+                parts = shlex.split(command)
+            except ValueError as e:
+                logger.error(f"Failed to parse command: {command}, error: {e}")
+                return False, "", f"Failed to parse command: {e}"
+        else:
+            parts = command.split()
         
         if len(parts) < 2:
             logger.error(f"Invalid python command format: {command}")
@@ -294,37 +540,30 @@ class SkillManager:
         script_name = parts[1]  # e.g., "classify_files_by_size.py"
         script_args = parts[2:] if len(parts) > 2 else []
         
-        # Check if script_name is already an absolute path
-        script_path = Path(script_name)
-        if not script_path.is_absolute():
-            # Try to locate the script in skill directories
-            script_path = self._locate_skill_script(script_name)
-            if not script_path:
-                logger.error(f"Could not locate script: {script_name}")
-                return False, "", f"Script not found: {script_name}"
-        
-        # Verify script exists
-        if not script_path.exists():
-            logger.error(f"Script does not exist: {script_path}")
-            return False, "", f"Script not found: {script_path}"
-        
-        # Get absolute path to venv activate script
-        project_root = Path(__file__).parent.parent
-        venv_activate = project_root / self.venv_path / "bin" / "activate"
-        
-        # Determine the Python executable to use
-        if venv_activate.exists():
-            # Use the venv's Python executable directly (avoids shell escaping issues)
-            python_executable = project_root / self.venv_path / "bin" / "python"
-            if not python_executable.exists():
-                python_executable = "python"  # Fallback
-        else:
-            logger.warning(f"Virtual environment not found at {self.venv_path}, running without venv")
-            python_executable = "python"
+        # Scripts indexed at scan time already have their base command
+        base_cmd = self._script_argv.get(script_name)
+        if base_cmd is None:
+            # Check if script_name is already an absolute path
+            script_path = Path(script_name)
+            if not script_path.is_absolute():
+                # Try to locate the script in skill directories
+                script_path = self._locate_skill_script(script_name)
+                if not script_path:
+                    logger.error(f"Could not locate script: {script_name}")
+                    return False, "", f"Script not found: {script_name}"
+            
+            # Verify script exists
+            if not script_path.exists():
+                logger.error(f"Script does not exist: {script_path}")
+                return False, "", f"Script not found: {script_path}"
+            
+            base_cmd = [self.python_executable, str(script_path)]
+            if not Path(script_name).is_absolute():
+                self._script_argv[script_name] = base_cmd
         
         # Build command as a list (NOT a string) to preserve newlines in arguments
         # This avoids shell interpretation issues entirely
-        shell_cmd = [str(python_executable), str(script_path)] + script_args
+        shell_cmd = base_cmd + script_args
         
         logger.debug(f"Executing (list form): {shell_cmd}")
         logger.debug(f"Working directory: {cwd}")
@@ -378,19 +617,8 @@ class SkillManager:
         
         logger.debug(f"Extracted -c argument (length={len(code_arg)})")
         
-        # Get Python executable
-        project_root = Path(__file__).parent.parent
-        venv_activate = project_root / self.venv_path / "bin" / "activate"
-        
-        if venv_activate.exists():
-            python_executable = project_root / self.venv_path / "bin" / "python"
-            if not python_executable.exists():
-                python_executable = "python"
-        else:
-            python_executable = "python"
-        
         # Build command - pass the code as a single argument
-        shell_cmd = [str(python_executable), str(script_path), "-c", code_arg]
+        shell_cmd = [self.python_executable, str(script_path), "-c", code_arg]
         
         logger.debug(f"Executing fs_ops command with -c argument")
         logger.debug(f"Working directory: {cwd}")
@@ -414,28 +642,16 @@ class SkillManager:
         if not s or s[0] != quote_char:
             return None
         
-        result = []
-        i = 1  # Start after opening quote
-        
-        while i < len(s):
-            char = s[i]
-            
-            if char == '\\' and i + 1 < len(s):
-                # Escape sequence - keep as-is (don't process)
-                next_char = s[i + 1]
-                result.append(char)
-                result.append(next_char)
-                i += 2
-            elif char == quote_char:
-                # Found closing quote
-                return ''.join(result)
-            else:
-                result.append(char)
-                i += 1
+        # Escapes are kept as-is, so the result is a plain slice of s. The regex
+        # consumes escape sequences whole, so any bare quote_char it yields is
+        # the closing quote.
+        for match in _QUOTE_TOKEN_RE.finditer(s, 1):
+            if match.group() == quote_char:
+                return s[1:match.start()]
         
         # No closing quote found - return what we have (best effort)
         logger.warning("No closing quote found, using best-effort extraction")
-        return ''.join(result)
+        return s[1:]
     
     def _execute_shell_command(self, command: str, cwd: Path) -> Tuple[bool, str, str]:
         """
@@ -455,6 +671,9 @@ class SkillManager:
         """
         Run a subprocess and capture output.
         
+        Both pipes are drained incrementally as raw bytes (capped at
+        _MAX_OUTPUT_BYTES each) and decoded once the process is done.
+        
         Args:
             cmd: Command as list of strings
             cwd: Working directory
@@ -462,23 +681,30 @@ class SkillManager:
         Returns:
             Tuple of (success, stdout, stderr)
         """
+        deadline = time.monotonic() + 300  # 5 minute timeout
+        
         try:
-            result = subprocess.run(
+            with subprocess.Popen(
                 cmd,
                 cwd=str(cwd),
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
-            )
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            ) as proc:
+                try:
+                    stdout_bytes, stderr_bytes = self._drain_pipes(proc, deadline)
+                    returncode = proc.wait(timeout=max(deadline - time.monotonic(), 0))
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    raise
             
-            success = result.returncode == 0
-            stdout = result.stdout
-            stderr = result.stderr
+            success = returncode == 0
+            stdout = self._decode_output(stdout_bytes)
+            stderr = self._decode_output(stderr_bytes)
             
             if success:
-                logger.debug(f"Command succeeded (exit code: {result.returncode})")
+                logger.debug(f"Command succeeded (exit code: {returncode})")
             else:
-                logger.error(f"Command failed (exit code: {result.returncode})")
+                logger.error(f"Command failed (exit code: {returncode})")
             
             return success, stdout, stderr
             
@@ -489,6 +715,72 @@ class SkillManager:
             logger.error(f"Subprocess execution failed: {e}")
             return False, "", str(e)
     
+    def _drain_pipes(self, proc: subprocess.Popen, deadline: float) -> Tuple[bytearray, bytearray]:
+        """
+        Read a process's stdout and stderr until both reach EOF.
+        
+        On POSIX both pipes are multiplexed with a selector, so memory stays
+        bounded while reading. Windows selectors only accept sockets, so there
+        the output is collected with communicate() and capped afterwards.
+        
+        Args:
+            proc: Process started with stdout and stderr pipes
+            deadline: time.monotonic() value after which reading gives up
+            
+        Returns:
+            Tuple of (stdout, stderr) bytes, each capped at _MAX_OUTPUT_BYTES
+            
+        Raises:
+            subprocess.TimeoutExpired: If the deadline passes first
+        """
+        if os.name == "nt":
+            stdout, stderr = proc.communicate(timeout=max(deadline - time.monotonic(), 0))
+            return self._cap_output(stdout), self._cap_output(stderr)
+        
+        sinks = {proc.stdout.fileno(): bytearray(), proc.stderr.fileno(): bytearray()}
+        truncated = set()
+        
+        with selectors.DefaultSelector() as selector:
+            selector.register(proc.stdout, selectors.EVENT_READ)
+            selector.register(proc.stderr, selectors.EVENT_READ)
+            
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(proc.args, 300)
+                
+                for key, _ in selector.select(remaining):
+                    data = os.read(key.fd, _PIPE_READ_SIZE)
+                    if not data:
+                        selector.unregister(key.fileobj)
+                        continue
+                    
+                    # Keep draining past the cap so the child never blocks on a full pipe
+                    sink = sinks[key.fd]
+                    room = _MAX_OUTPUT_BYTES - len(sink)
+                    if len(data) > room:
+                        if key.fd not in truncated:
+                            sink += data[:room] + _TRUNCATED_MARKER
+                            truncated.add(key.fd)
+                            logger.warning(f"Command output exceeded {_MAX_OUTPUT_BYTES} bytes, truncating")
+                    else:
+                        sink += data
+        
+        return sinks[proc.stdout.fileno()], sinks[proc.stderr.fileno()]
+    
+    @staticmethod
+    def _cap_output(data: bytes) -> bytearray:
+        """Truncate fully collected output to _MAX_OUTPUT_BYTES, like the pipe drain does"""
+        if len(data) <= _MAX_OUTPUT_BYTES:
+            return bytearray(data)
+        logger.warning(f"Command output exceeded {_MAX_OUTPUT_BYTES} bytes, truncating")
+        return bytearray(data[:_MAX_OUTPUT_BYTES]) + _TRUNCATED_MARKER
+    
+    @staticmethod
+    def _decode_output(data: bytes) -> str:
+        """Decode captured output the way text-mode pipes would (UTF-8, universal newlines)"""
+        return data.decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
+    
     def _check_quotes_balanced(self, s: str) -> bool:
         """
         Check if quotes are balanced in a string.
@@ -503,29 +795,51 @@ class SkillManager:
         Returns:
             True if quotes are balanced, False otherwise
         """
-        in_single_quote = False
-        in_double_quote = False
-        i = 0
+        in_single_quote, in_double_quote = self._scan_quote_state(s)
         
-        while i < len(s):
-            char = s[i]
+        # Quotes are balanced if we're not inside any quote
+        return not in_single_quote and not in_double_quote
+    
+    def _scan_quote_state(
+        self,
+        s: str,
+        in_single_quote: bool = False,
+        in_double_quote: bool = False,
+        posix: bool = False
+    ) -> Tuple[bool, bool]:
+        """
+        Advance the quote state over s, starting from the given state.
+        
+        Lets callers scan text incrementally (e.g. line by line) instead of
+        rescanning everything accumulated so far.
+        
+        Args:
+            s: String to scan
+            in_single_quote: Whether s starts inside a single-quoted string
+            in_double_quote: Whether s starts inside a double-quoted string
+            posix: Follow shell rules, where a backslash inside single quotes is
+                literal. Otherwise a backslash escapes the next character
+                everywhere, as in the Python payloads of write_file commands.
             
-            # Handle escape sequences
-            if char == '\\' and i + 1 < len(s):
-                # Skip escaped character
-                i += 2
-                continue
+        Returns:
+            Tuple of (in_single_quote, in_double_quote) at the end of s
+        """
+        # Only escape sequences and quotes are visited; the regex engine skips
+        # everything in between
+        for match in _QUOTE_TOKEN_RE.finditer(s):
+            token = match.group()
+            
+            # Inside shell single quotes a backslash is literal, so "\'" closes them
+            if posix and in_single_quote and token == "\\'":
+                in_single_quote = False
             
-            # Toggle quote state
-            if char == '"' and not in_single_quote:
+            # Toggle quote state (escaped characters are matched as one token)
+            elif token == '"' and not in_single_quote:
                 in_double_quote = not in_double_quote
-            elif char == "'" and not in_double_quote:
+            elif token == "'" and not in_double_quote:
                 in_single_quote = not in_single_quote
-            
-            i += 1
         
-        # Quotes are balanced if we're not inside any quote
-        return not in_single_quote and not in_double_quote
+        return in_single_quote, in_double_quote
     
     def extract_commands_from_text(self, text: str) -> List[str]:
         """
@@ -536,10 +850,11 @@ class SkillManager:
             text: Text to search for commands
             
         Returns:
-            List of extracted commands (deduplicated and ordered)
+            List of extracted commands, in order. A code block that repeats an
+            earlier block verbatim is skipped; commands repeated within or
+            across different blocks are all kept, since each one may be an
+            intended step.
         """
-        import shlex
-        
         command = []
         
         def extract_commands_from_code(code: str) -> List[str]:
@@ -553,14 +868,24 @@ class SkillManager:
                 List of complete commands
             """
             result = []
-            lines = code.split('\n')
             current_command = []
-            in_quotes = False
+            in_single_quote = False
+            in_double_quote = False
+            line_continues = False
+            
+            # Shell quoting rules apply unless the command writes a file, whose
+            # Python payload escapes quotes with backslashes. Both states are
+            # tracked, since "write_file" may only show up on a later line.
+            shell_state = (False, False)
+            payload_state = (False, False)
+            is_write_file = False
             
-            for line in lines:
+            for line in code.split('\n'):
+                in_quotes = in_single_quote or in_double_quote or line_continues
                 stripped = line.strip()
                 
                 # Skip empty lines and comments when not in a quoted string
+                # or a backslash line continuation
                 if not in_quotes:
                     if not stripped or stripped.startswith('#'):
                         continue
@@ -570,38 +895,32 @@ class SkillManager:
                 if current_command:
                     current_command.append(line)  # Keep original whitespace for multi-line
                 else:
-                    current_command.append(stripped)
+                    line = stripped
+                    current_command.append(line)
                 
-                # Check quote state by scanning the accumulated command
-                full_cmd = '\n'.join(current_command)
-                
-                # Special handling for fs.write_file commands - use manual quote matching
-                # because shlex.split() fails on long strings with \n escape sequences
-                if 'fs.write_file' in full_cmd or 'write_file' in full_cmd:
-                    # Use manual quote balance check
-                    if self._check_quotes_balanced(full_cmd):
-                        complete_cmd = full_cmd.strip()
-                        if complete_cmd:
-                            result.append(complete_cmd)
-                        current_command = []
-                        in_quotes = False
-                    else:
-                        in_quotes = True
-                else:
-                    # Use shlex to check if quotes are balanced
-                    try:
-                        shlex.split(full_cmd)
-                        # If no exception, quotes are balanced - command is complete
-                        complete_cmd = full_cmd.strip()
-                        if complete_cmd:
-                            result.append(complete_cmd)
-                        current_command = []
-                        in_quotes = False
-                    except ValueError:
-                        # Unbalanced quotes - continue accumulating
-                        in_quotes = True
-            
-            # Handle any remaining accumulated command (even if quotes unbalanced)
+                # Update the quote state with the new line only; the state of the
+                # lines accumulated so far is carried over, so each character is
+                # scanned once. Manual scanning is used because shlex.split() fails
+                # on long strings with \n escape sequences (e.g. fs.write_file).
+                shell_state = self._scan_quote_state(line, *shell_state, posix=True)
+                payload_state = self._scan_quote_state(line, *payload_state)
+                is_write_file = is_write_file or 'write_file' in line
+                in_single_quote, in_double_quote = (
+                    payload_state if is_write_file else shell_state
+                )
+                # A line ending in an unescaped backslash continues on the next line
+                line_continues = (len(line) - len(line.rstrip('\\'))) % 2 == 1
+                if not in_single_quote and not in_double_quote and not line_continues:
+                    # Quotes are balanced - command is complete
+                    complete_cmd = '\n'.join(current_command).strip()
+                    if complete_cmd:
+                        result.append(complete_cmd)
+                    current_command = []
+                    shell_state = payload_state = (False, False)
+                    is_write_file = False
+            
+            # Handle any remaining accumulated command (even if quotes unbalanced
+            # or the last line ends in a continuation backslash)
             if current_command:
                 complete_cmd = '\n'.join(current_command).strip()
                 if complete_cmd:
@@ -609,12 +928,15 @@ class SkillManager:
             
             return result
         
-        # This is the recommended format from system prompt
-        code_block_pattern = r'```(?:bash|shell|python|sh)\s*\n(.*?)```'
-        match = re.search(code_block_pattern, text, re.DOTALL)
-        if match:
+        # This is the recommended format from system prompt. All code blocks are
+        # collected in one pass; only whole blocks that repeat verbatim are dropped.
+        seen_blocks = set()
+        for match in _CODE_BLOCK_RE.finditer(text):
             code = match.group(1).strip()
-            command = extract_commands_from_code(code)
+            if code in seen_blocks:
+                continue
+            seen_blocks.add(code)
+            command.extend(extract_commands_from_code(code))
         
         # Log extracted command for debugging
         if command:
@@ -625,3 +947,38 @@ class SkillManager:
         return command
 
 
+_default_skill_manager: Optional[SkillManager] = None
+_default_skill_manager_lock = threading.Lock()
+
+
+def get_skill_manager(skill_dir: str = "skills", venv_path: Optional[str] = None) -> SkillManager:
+    """
+    Get the process-wide SkillManager.
+    
+    The cached instance is reused as long as it was built for the same
+    directories; if skills changed on disk since it was scanned, it is
+    reloaded in place first.
+    
+    Args:
+        skill_dir: Directory containing skill folders
+        venv_path: Path to virtual environment (default: .venv)
+        
+    Returns:
+        Shared SkillManager instance
+    """
+    global _default_skill_manager
+    
+    with _default_skill_manager_lock:
+        manager = _default_skill_manager
+        if (
+            manager is None
+            or manager.skill_dir != Path(skill_dir)
+            or manager.venv_path != Path(venv_path or ".venv")
+        ):
+            manager = SkillManager(skill_dir=skill_dir, venv_path=venv_path)
+            _default_skill_manager = manager
+        elif manager.is_stale():
+            logger.info(f"Skills changed in {manager.skill_dir}, reloading")
+            manager.reload()
+        
+        return manager
@@ -1,6 +1,9 @@
 import os
 from notion_client import Client
 import sys
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 
@@ -17,9 +20,17 @@ def get_notion_client():
     return Client(auth=api_key)
 
 
+# Per-client cache of resolved search results: {(title, object_type): id}
+_search_cache = weakref.WeakKeyDictionary()
+
+
 def _find_object(notion: Client, title: str, object_type: str):
     """Generic helper to find a Notion page or database by title.
 
+    Successful lookups are cached per client, so repeated searches for the same
+    title cost a single API call. Misses are not cached, since the object may
+    still be created later.
+
     Args:
         notion: Authenticated Notion Client.
         title: Title (or partial title) to search for.
@@ -28,6 +39,18 @@ def _find_object(notion: Client, title: str, object_type: str):
     Returns:
         The ID string if found, otherwise None.
     """
+    cache = _search_cache.setdefault(notion, {})
+    key = (title, object_type)
+    if key not in cache:
+        object_id = _search_object(notion, title, object_type)
+        if object_id is None:
+            return None
+        cache[key] = object_id
+    return cache[key]
+
+
+def _search_object(notion: Client, title: str, object_type: str):
+    """Runs the Notion search behind _find_object and picks the best match."""
     search_results = (
         notion.search(
             query=title, filter={"property": "object", "value": object_type}
@@ -118,10 +141,84 @@ def find_database(notion: Client, db_title: str):
     return _find_object(notion, db_title, "database")
 
 
+def _has_ancestor(notion: Client, obj: dict, ancestor_id: str, parent_of: dict):
+    """
+    Checks whether a Notion object sits somewhere below ancestor_id by following
+    its parent chain. Parent lookups are memoized in parent_of.
+
+    The chain stops at database rows (database_id parents), since the block tree
+    walk never descends into them. Failed lookups raise instead of being read as
+    "not an ancestor".
+    """
+    target = ancestor_id.replace("-", "")
+    parent = obj.get("parent", {})
+    seen = set()
+    while True:
+        parent_type = parent.get("type")
+        if parent_type not in ("page_id", "block_id"):
+            return False
+        parent_id = parent[parent_type]
+        if parent_id.replace("-", "") == target:
+            return True
+        if parent_id in seen:
+            return False
+        seen.add(parent_id)
+
+        if parent_id not in parent_of:
+            if parent_type == "page_id":
+                parent_obj = notion.pages.retrieve(page_id=parent_id)
+            else:
+                parent_obj = notion.blocks.retrieve(block_id=parent_id)
+            # The tree walk never descends into trashed blocks, so a trashed
+            # ancestor breaks the chain
+            if parent_obj.get("archived") or parent_obj.get("in_trash"):
+                parent_of[parent_id] = {}
+            else:
+                parent_of[parent_id] = parent_obj.get("parent", {})
+        parent = parent_of[parent_id]
+
+
 def find_database_in_block(notion: Client, block_id: str, db_title: str):
     """
     Recursively find a database by title within a block.
+
+    Databases with the exact title are looked up with a single search and kept
+    only if they are not trashed and descend from block_id. The block tree is
+    walked when the search does not turn up exactly one such database, so that
+    duplicate titles resolve in the page's depth-first order, and whenever a
+    search or parent lookup fails.
     """
+    try:
+        search_results = (
+            notion.search(
+                query=db_title, filter={"property": "object", "value": "database"}
+            ).get("results")
+            or []
+        )
+    except Exception:
+        search_results = []
+
+    parent_of = {}
+    candidates = []
+    try:
+        for result in search_results:
+            if result.get("archived") or result.get("in_trash"):
+                continue
+            title = "".join(t.get("plain_text", "") for t in result.get("title", []))
+            if title == db_title and _has_ancestor(notion, result, block_id, parent_of):
+                candidates.append(result["id"])
+    except Exception:
+        # A throttled or failed parent lookup may have hidden a candidate
+        candidates = []
+
+    if len(candidates) == 1:
+        return candidates[0]
+
+    return _find_database_in_block_tree(notion, block_id, db_title)
+
+
+def _find_database_in_block_tree(notion: Client, block_id: str, db_title: str):
+    """Walks the block tree below block_id looking for a child database by title."""
     blocks = notion.blocks.children.list(block_id=block_id).get("results")
     for block in blocks:
         if (
@@ -130,29 +227,75 @@ def find_database_in_block(notion: Client, block_id: str, db_title: str):
         ):
             return block["id"]
         if block.get("has_children"):
-            db_id = find_database_in_block(notion, block["id"], db_title)
+            db_id = _find_database_in_block_tree(notion, block["id"], db_title)
             if db_id:
                 return db_id
     return None
 
 
-def get_all_blocks_recursively(notion: Client, block_id: str):
+# HTTP statuses worth retrying: rate limiting and transient server errors
+_RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+def _list_child_blocks(notion: Client, block_id: str, max_retries: int = 5):
+    """
+    Returns the direct children of a block.
+
+    Rate-limit and server errors are retried with exponential backoff and
+    re-raised once the retries run out, so a throttled request never silently
+    drops a subtree. Any other API error yields an empty list.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return notion.blocks.children.list(block_id=block_id).get("results", [])
+        except Exception as e:
+            if getattr(e, "status", None) not in _RETRYABLE_STATUSES:
+                return []
+            if attempt == max_retries:
+                raise
+            time.sleep(2**attempt)
+
+
+def get_all_blocks_recursively(notion: Client, block_id: str, max_workers: int = 3):
     """
     Recursively fetches all blocks from a starting block ID and its children,
     returning a single flat list of block objects.
+
+    The tree is fetched level by level, with the children of every block on a
+    level requested concurrently by up to max_workers threads. Requests are not
+    paced, so wide trees can exceed the Notion API rate limit (about three
+    requests per second); throttled requests are retried with backoff in
+    _list_child_blocks. The result keeps depth-first order (each block is
+    followed by its descendants).
     """
-    all_blocks = []
-    try:
-        direct_children = notion.blocks.children.list(block_id=block_id).get(
-            "results", []
-        )
-    except Exception:
-        return []
+    children_of = {block_id: _list_child_blocks(notion, block_id)}
+    frontier = [
+        block["id"] for block in children_of[block_id] if block.get("has_children")
+    ]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while frontier:
+            level = executor.map(
+                lambda child_id: _list_child_blocks(notion, child_id), frontier
+            )
+            next_frontier = []
+            for parent_id, children in zip(frontier, level):
+                children_of[parent_id] = children
+                next_frontier.extend(
+                    block["id"] for block in children if block.get("has_children")
+                )
+            frontier = next_frontier
 
-    for block in direct_children:
+    all_blocks = []
+    stack = [iter(children_of[block_id])]
+    while stack:
+        block = next(stack[-1], None)
+        if block is None:
+            stack.pop()
+            continue
         all_blocks.append(block)
         if block.get("has_children"):
-            all_blocks.extend(get_all_blocks_recursively(notion, block["id"]))
+            stack.append(iter(children_of.get(block["id"], [])))
 
     return all_blocks
 
@@ -0,0 +1,81 @@
+"""
+Tests for skill catalog loading and command extraction in SkillManager.
+"""
+
+import os
+import tempfile
+import unittest
+
+from src.skill_manager import SkillManager
+
+
+class TestExtractCommands(unittest.TestCase):
+    def setUp(self):
+        self.manager = SkillManager(skill_dir="/nonexistent-skill-dir")
+
+    def test_backslash_line_continuation(self):
+        text = "```bash\npython create_post.py --title foo \\\n  --body bar\n```"
+        self.assertEqual(
+            self.manager.extract_commands_from_text(text),
+            ["python create_post.py --title foo \\\n  --body bar"],
+        )
+
+    def test_escaped_backslash_ends_command(self):
+        text = "```bash\necho a\\\\\nls\n```"
+        self.assertEqual(
+            self.manager.extract_commands_from_text(text),
+            ["echo a\\\\", "ls"],
+        )
+
+    def test_backslash_is_literal_in_shell_single_quotes(self):
+        text = "```bash\npython a.py 'C:\\path\\'\npython b.py\n```"
+        self.assertEqual(
+            self.manager.extract_commands_from_text(text),
+            ["python a.py 'C:\\path\\'", "python b.py"],
+        )
+
+    def test_write_file_payload_keeps_escaped_quotes(self):
+        text = "```bash\npython run_fs_ops.py -c 'fs.write_file(\"a\", \"it\\'s\n\")'\nls\n```"
+        self.assertEqual(
+            self.manager.extract_commands_from_text(text),
+            ["python run_fs_ops.py -c 'fs.write_file(\"a\", \"it\\'s\n\")'", "ls"],
+        )
+
+    def test_repeated_command_in_block_is_kept(self):
+        text = "```bash\npython a.py --move x y\nls\npython a.py --move x y\n```"
+        self.assertEqual(
+            self.manager.extract_commands_from_text(text),
+            ["python a.py --move x y", "ls", "python a.py --move x y"],
+        )
+
+    def test_verbatim_repeated_block_is_skipped(self):
+        text = "```bash\nls\n```\nAgain:\n```bash\nls\n```\n```sh\npwd\nls\n```"
+        self.assertEqual(
+            self.manager.extract_commands_from_text(text),
+            ["ls", "pwd", "ls"],
+        )
+
+
+class TestCatalogCache(unittest.TestCase):
+    def test_fixed_invalid_skill_md_is_picked_up(self):
+        with tempfile.TemporaryDirectory() as skill_dir:
+            for name, frontmatter in (("a", "name: a\ndescription: x\n"), ("b", "name: b\n")):
+                os.mkdir(os.path.join(skill_dir, name))
+                with open(os.path.join(skill_dir, name, "SKILL.md"), "w") as f:
+                    f.write(f"---\n{frontmatter}---\n")
+
+            manager = SkillManager(skill_dir=skill_dir)
+            self.assertEqual(sorted(manager.skills), ["a"])
+
+            md_path = os.path.join(skill_dir, "b", "SKILL.md")
+            with open(md_path, "w") as f:
+                f.write("---\nname: b\ndescription: y\n---\n")
+            stat = os.stat(md_path)
+            os.utime(md_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+            self.assertTrue(manager.is_stale())
+            self.assertEqual(sorted(SkillManager(skill_dir=skill_dir).skills), ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()